@@ -2,16 +2,25 @@ import discord
 import os
 import json
 import asyncio
+import threading
 from datetime import datetime
 import pytz
+import numpy as np
 from dotenv import load_dotenv
 from discord.ext import commands, tasks
 
 # --- Custom Imports ---
-from leetcode_buddy import get_user_stats
 from website import start_website
+from live_updates import broadcaster, publish_user, user_card
+from community_stats import community_stats
 from commands import UserCommands, welcome_user
 from help_system import HelpSystem
+from backup import MANUAL_BACKUP_DIR, create_backup, list_backups, load_backup
+from user_records import load_records, dump_records
+from sync_queue import SyncQueue, fetch_directly, result_to_stats
+from health import health
+from daily_challenge import today_start_timestamp
+from streaks import CALENDAR_OFFSET_SECONDS, evaluate_activity, pack_submissions
 # Updated Import: Use the new generic AI response function
 from ai_helper import get_ai_response
 
@@ -26,26 +35,132 @@ intents.message_content = True
 intents.members = True          
 intents.guilds = True
 
+# Helpers are created once in on_ready (which fires again after a failed RESUME)
+user_commands = None
+help_system = None
+
+class GhostBot(commands.Bot):
+    async def setup_hook(self):
+        """Runs once before login, so /healthz works while the gateway is still down"""
+        self.lag_monitor = asyncio.create_task(health.monitor_loop_lag())
+
+    async def close(self):
+        """Flush batched reputation points before shutting down"""
+        if help_system is not None:
+            help_system.flush_reputation()
+        await super().close()
+
 # Disable default help to prevent double messages
-bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
+bot = GhostBot(command_prefix='!', intents=intents, help_command=None)
 
 # --- Database Management ---
 DB_FILE = 'user_data.json'
 users_db = {}
 
 def load_user_data():
-    global users_db
+    # Filled in place so UserCommands and the website keep the same dict
+    users_db.clear()
     try:
         with open(DB_FILE, 'r') as f:
-            users_db = json.load(f)
+            users_db.update(load_records(json.load(f)))
     except FileNotFoundError:
-        users_db = {}
+        pass
+
+# Each save gets a generation number so a slow threaded write can't overwrite a newer one
+_save_lock = threading.Lock()
+_save_generation = 0
+_written_generation = 0
+
+def write_user_data(data, generation):
+    """Atomically write already-serialized records (safe to call from a thread)"""
+    global _written_generation
+    with _save_lock:
+        if generation <= _written_generation:
+            return
+        tmp_path = f"{DB_FILE}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, DB_FILE)
+        _written_generation = generation
 
 def save_user_data():
-    with open(DB_FILE, 'w') as f:
-        json.dump(users_db, f)
+    global _save_generation
+    _save_generation += 1
+    write_user_data(dump_records(users_db), _save_generation)
+
+async def save_user_data_async():
+    """Copy the records on the event loop, then do the file write in a thread"""
+    global _save_generation
+    _save_generation += 1
+    await asyncio.to_thread(write_user_data, dump_records(users_db), _save_generation)
+
+# Saves queued for the writer thread but not yet on disk
+health.add_backlog_source('user_data', lambda: _save_generation - _written_generation)
+
+# --- Background Sync (results written by sync_worker.py) ---
+sync_queue = SyncQueue()
+last_sync_seq = 0
+# The daily check reports from the records it has once this much time has passed
+CHECK_WAIT_SECONDS = 300
+# ...and fetches stragglers itself (until that deadline) once the worker has gone
+# this long without finishing a single job
+WORKER_STALL_SECONDS = 30
+
+def apply_user_stats(discord_id, stats):
+    """Copy fresh stats onto a record and notify the aggregates and dashboard"""
+    record = users_db[discord_id]
+    previous = record.copy()
+    record.apply_stats(stats)
+    community_stats.apply(previous, record)
+    publish_user(discord_id, record)
+    health.mark_synced()
+
+def update_streaks(activity):
+    """Refresh streaks for {discord_id: [timestamps]} in one vectorized pass"""
+    ids = [uid for uid in activity if uid in users_db]
+    if not ids:
+        return
+    user_index, timestamps = pack_submissions([activity[uid] for uid in ids])
+    # Activity comes from LeetCode's UTC-day calendar, so days are counted in UTC
+    offsets = np.full(len(ids), CALENDAR_OFFSET_SECONDS)
+    result = evaluate_activity(user_index, timestamps, offsets)
+
+    for discord_id, streak, capped in zip(ids, result['streak'].tolist(), result['streak_capped'].tolist()):
+        record = users_db[discord_id]
+        if (record.streak, record.streak_capped) != (streak, capped):
+            record.streak = streak
+            record.streak_capped = capped
+            publish_user(discord_id, record)
+
+async def apply_sync_results():
+    """Pull results the worker wrote since we last looked into users_db"""
+    global last_sync_seq
+    rows = await asyncio.to_thread(sync_queue.results_since, last_sync_seq)
+    activity = {}
+    for row in rows:
+        last_sync_seq = max(last_sync_seq, row['seq'])
+        record = users_db.get(row['discord_id'])
+        # Skip stale results for users who unregistered or changed username
+        if row['found'] and record and record.leetcode_username == row['username']:
+            stats = result_to_stats(row)
+            apply_user_stats(row['discord_id'], stats)
+            activity[row['discord_id']] = stats['activity_timestamps']
+    if activity:
+        update_streaks(activity)
+        await save_user_data_async()
 
 # --- Core Logic: Daily Checker ---
+async def checked_since(timestamp):
+    """Registered users with a successful sync of their current username since timestamp"""
+    synced = await asyncio.to_thread(sync_queue.synced_since, timestamp)
+    return {
+        uid for uid, username in synced.items()
+        if uid in users_db and users_db[uid].leetcode_username == username
+    }
+
+def unchecked_note(count):
+    return f"\n\n_⏳ {count} user(s) couldn't be checked in time._" if count else ""
+
 async def run_check_logic(target_channel):
     """
     Checks status for all users, updates the database (for the website),
@@ -58,33 +173,57 @@ async def run_check_logic(target_channel):
     # Notify users check is starting
     status_msg = await target_channel.send("🔄 **Syncing Data & Checking Daily Status...**")
     
-    incomplete_users = []
-    
-    for discord_id, user_data in users_db.items():
-        # Handle backward compatibility (str -> dict)
-        if isinstance(user_data, str):
-            user_data = {'leetcode_username': user_data}
-            users_db[discord_id] = user_data
+    # 1. Only users not yet seen solving today's challenge need a fresh check;
+    # the rolling worker has already covered everyone else since it went live
+    challenge_start = today_start_timestamp()
+    since = await asyncio.to_thread(sync_queue.latest_seq)
+    await apply_sync_results()
+    checked_today = await checked_since(challenge_start)
+    pending = {uid for uid, record in users_db.items() if not (uid in checked_today and record.last_status)}
+    await asyncio.to_thread(
+        sync_queue.enqueue_many, [(uid, users_db[uid].leetcode_username) for uid in pending], True
+    )
 
-        username = user_data['leetcode_username']
-        
-        # 1. Fetch FULL stats from LeetCode
-        stats = get_user_stats(username)
-        
-        if stats:
-            # 2. Update Database (Live sync for Website)
-            users_db[discord_id]['total_solved'] = stats['total_solved']
-            users_db[discord_id]['breakdown'] = stats['breakdown']
-            users_db[discord_id]['last_status'] = stats['solved_today']
-            
-            # 3. Track incomplete users
-            if not stats['solved_today']:
-                incomplete_users.append(discord_id)
+    # 2. Wait for the worker's results (they update the database and the website as they land)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + CHECK_WAIT_SECONDS
+    last_progress = loop.time()
+    while pending and loop.time() < deadline and loop.time() - last_progress < WORKER_STALL_SECONDS:
+        await asyncio.sleep(2)
+        for row in await asyncio.to_thread(sync_queue.results_since, since):
+            since = max(since, row['seq'])
+            if row['discord_id'] in pending:
+                last_progress = loop.time()
+                pending.discard(row['discord_id'])
+                if not row['found']:
+                    print(f"⚠️ Failed to fetch stats for {row['username']}")
+        await apply_sync_results()
+
+    # 3. Worker stalled: fetch stragglers ourselves until the deadline, within the same
+    # rate budget. fetch_directly takes each job off the queue first so nobody is fetched twice.
+    activity = {}
+    for discord_id in list(pending):
+        if loop.time() >= deadline:
+            break
+        record = users_db.get(discord_id)
+        if record is None:
+            continue
+        stats = await fetch_directly(sync_queue, discord_id, record.leetcode_username)
+        if stats and discord_id in users_db:
+            apply_user_stats(discord_id, stats)
+            activity[discord_id] = stats['activity_timestamps']
         else:
-            print(f"⚠️ Failed to fetch stats for {username}")
+            print(f"⚠️ Failed to fetch stats for {record.leetcode_username}")
+    update_streaks(activity)
 
     # Save updated stats to JSON
-    save_user_data()
+    await save_user_data_async()
+
+    # Report from the records as they stand: users without a result since the
+    # challenge went live can't be judged either way
+    checked_today = await checked_since(challenge_start)
+    incomplete_users = [uid for uid in checked_today if not users_db[uid].last_status]
+    unchecked = len(users_db) - len(checked_today)
     
     # Cleanup notification
     try: await status_msg.delete()
@@ -95,7 +234,8 @@ async def run_check_logic(target_channel):
         mentions = " ".join([f"<@{uid}>" for uid in incomplete_users])
         embed = discord.Embed(
             title="🚨 Daily Challenge Report", 
-            description=f"The following users have **NOT** completed the daily challenge:\n\n{mentions}\n\n**Hurry up!** ⏳",
+            description=f"The following users have **NOT** completed the daily challenge:\n\n{mentions}\n\n**Hurry up!** ⏳"
+                        + unchecked_note(unchecked),
             color=0xff0000
         )
         tz = pytz.timezone('Asia/Kolkata')
@@ -104,7 +244,8 @@ async def run_check_logic(target_channel):
     else:
         embed = discord.Embed(
             title="✅ All Clear!", 
-            description="🎉 Everyone has completed today's challenge! Excellent work!", 
+            description=("🎉 Everyone has completed today's challenge! Excellent work!" if not unchecked
+                         else "🎉 Everyone checked so far has completed today's challenge!" + unchecked_note(unchecked)),
             color=0x00ff00
         )
         await target_channel.send(embed=embed)
@@ -112,22 +253,45 @@ async def run_check_logic(target_channel):
 # --- Events ---
 @bot.event
 async def on_ready():
-    load_user_data()
+    # Data and the website are loaded once at startup (see the entry point),
+    # since on_ready can fire again after a failed RESUME
     
-    # 1. Start the Website Server (Background Thread)
-    start_website()
-    
-    # 2. Initialize Helpers
+    # 1. Initialize Helpers (only once, so unflushed reputation isn't reloaded away)
     global user_commands, help_system
-    user_commands = UserCommands(users_db, save_user_data)
-    help_system = HelpSystem(save_user_data)
+    if help_system is None:
+        user_commands = UserCommands(users_db, save_user_data, sync_queue)
+        help_system = HelpSystem(save_user_data)
+        health.add_backlog_source('reputation', lambda: len(help_system.dirty_reputation))
+        health.add_backlog_source('reactions', lambda: int(help_system.reactions_dirty))
     
+    health.set_gateway(True)
     print(f"✅ Logged in as {bot.user}")
-    print("✅ Website is running on port 8080")
+    print("✅ Website is running on port 8080 (health: /healthz, /readyz)")
+    
+    # 2. Keep the worker's rolling schedule in line with the registered users
+    await asyncio.to_thread(
+        sync_queue.sync_schedule, {uid: r.leetcode_username for uid, r in users_db.items()}
+    )
     
-    # 3. Start Scheduled Task
+    # 3. Start Scheduled Tasks
     if not daily_check_loop.is_running():
         daily_check_loop.start()
+    if not reputation_flush_loop.is_running():
+        reputation_flush_loop.start()
+    if not backup_loop.is_running():
+        backup_loop.start()
+    if not stats_check_loop.is_running():
+        stats_check_loop.start()
+    if not sync_results_loop.is_running():
+        sync_results_loop.start()
+
+@bot.event
+async def on_resumed():
+    health.set_gateway(True)
+
+@bot.event
+async def on_disconnect():
+    health.set_gateway(False)
 
 @bot.event
 async def on_member_join(member):
@@ -136,6 +300,19 @@ async def on_member_join(member):
     if channel: 
         await welcome_user(member, channel) 
 
+@bot.event
+async def on_raw_reaction_add(payload):
+    """👍/✅ on a question or snippet gives its author a helpful point"""
+    if help_system is None or payload.user_id == bot.user.id:
+        return
+    await help_system.handle_reaction(payload, added=True)
+
+@bot.event
+async def on_raw_reaction_remove(payload):
+    if help_system is None or payload.user_id == bot.user.id:
+        return
+    await help_system.handle_reaction(payload, added=False)
+
 @bot.event
 async def on_message(message):
     """Master Router for all commands"""
@@ -196,6 +373,9 @@ async def on_message(message):
         elif msg.startswith('!code'):
             await help_system.share_code(message)
             return
+        elif msg.startswith('!snippet'):
+            await help_system.show_snippet(message)
+            return
         elif msg == '!questions':
             await help_system.show_questions(message)
             return
@@ -241,19 +421,95 @@ async def daily_check_loop():
         channel = bot.get_channel(CHANNEL_ID)
         if channel: await run_check_logic(channel)
 
+@tasks.loop(seconds=15)
+async def sync_results_loop():
+    """Keep !mystatus, the leaderboard and the website fresh from the sync worker"""
+    # An unhandled error would stop the loop for good, leaving everything stale
+    try:
+        await apply_sync_results()
+    except Exception as e:
+        print(f"⚠️ Applying sync results failed: {e}")
+
+@tasks.loop(seconds=30)
+async def reputation_flush_loop():
+    """Persist batched reputation changes from reactions"""
+    try:
+        help_system.flush_reputation()
+    except Exception as e:
+        print(f"⚠️ Reputation flush failed: {e}")
+
+@tasks.loop(hours=6)
+async def backup_loop():
+    """Rotating local snapshots of all data files"""
+    try:
+        path = await create_backup(
+            users_db, help_system.questions, help_system.reputation, help_system.reaction_state()
+        )
+        print(f"✅ Backup written to {path}")
+    except Exception as e:
+        print(f"⚠️ Scheduled backup failed: {e}")
+
+@tasks.loop(hours=1)
+async def stats_check_loop():
+    """Catch any drift between the running aggregates and the database"""
+    if not community_stats.verify(users_db):
+        broadcaster.publish_stats(community_stats.summary())
+
 # --- Admin & Utility Commands ---
 
 @bot.command()
+@commands.has_permissions(administrator=True)
 async def backup(ctx):
-    """Sends a copy of the user database file"""
-    if not os.path.exists(DB_FILE):
-        await ctx.send("⚠️ No database file found yet (no users registered).")
-        return
-    
+    """Sends a snapshot archive of all data files"""
+    path = None
     try:
-        await ctx.send("📦 **Here is your user data backup:**", file=discord.File(DB_FILE))
+        # Kept apart from the rotating scheduled backups that !restore relies on
+        path = await create_backup(
+            users_db, help_system.questions, help_system.reputation, help_system.reaction_state(),
+            directory=MANUAL_BACKUP_DIR, rotate=False
+        )
+        await ctx.send("📦 **Here is your data backup:**", file=discord.File(path))
     except Exception as e:
         await ctx.send(f"❌ Error creating backup: {e}")
+    finally:
+        # Manual archives aren't rotated, so never leave one behind (e.g. over the upload limit)
+        if path and os.path.exists(path):
+            os.remove(path)
+
+@bot.command()
+@commands.has_permissions(administrator=True)
+async def restore(ctx, name=None):
+    """Restores all data files from a local backup"""
+    backups = list_backups()
+    if not name:
+        if not backups:
+            await ctx.send("⚠️ No local backups found.")
+            return
+        listing = "\n".join(f"`{b}`" for b in backups[::-1])
+        await ctx.send(f"🗂️ **Available backups (newest first):**\n{listing}\n\nUse `!restore <name>` to restore one.")
+        return
+
+    stores = await load_backup(name)
+    if stores is None:
+        await ctx.send(f"❌ Backup `{name}` not found.")
+        return
+
+    previous_ids = set(users_db)
+    users_db.clear()
+    users_db.update(load_records(stores.get('user_data.json', {})))
+    save_user_data()
+    community_stats.rebuild(users_db)
+    await asyncio.to_thread(
+        sync_queue.sync_schedule, {uid: r.leetcode_username for uid, r in users_db.items()}
+    )
+    help_system.restore_data(
+        stores.get('questions.json', {}), stores.get('reputation.json', {}), stores.get('reactions.json', {})
+    )
+
+    for discord_id in previous_ids | set(users_db):
+        publish_user(discord_id, users_db.get(discord_id))
+
+    await ctx.send(f"♻️ Restored data from `{name}` ({len(users_db)} users).")
 
 @bot.command()
 async def force_check(ctx):
@@ -262,4 +518,14 @@ async def force_check(ctx):
 
 # --- Entry Point ---
 if __name__ == "__main__":
+    load_user_data()
+    community_stats.rebuild(users_db)
+    broadcaster.seed(
+        {uid: user_card(uid, info) for uid, info in users_db.items()},
+        community_stats.summary()
+    )
+
+    # Website and /healthz, /readyz come up before login; /readyz reports
+    # gateway_connected: false until READY
+    start_website(users_db)
     bot.run(TOKEN)
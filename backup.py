@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import tarfile
+import tempfile
+import time
+from datetime import datetime
+import pytz
+
+from snippet_store import SNIPPET_DIR
+from user_records import dump_records
+
+BACKUP_DIR = 'backups'
+# On-demand !backup archives live here so they never push scheduled ones out of rotation
+MANUAL_BACKUP_DIR = os.path.join(BACKUP_DIR, 'manual')
+# Number of archives kept by the rotating scheduled backups
+KEEP_BACKUPS = 7
+# Stores larger than this are spooled to a temp file instead of memory while archiving
+SPOOL_LIMIT = 1024 * 1024
+IST = pytz.timezone('Asia/Kolkata')
+
+
+def _copy_records(store):
+    # Records are flat dicts whose lists are replaced (not mutated), so a
+    # one-level copy is enough to freeze them
+    return {k: dict(v) if isinstance(v, dict) else v for k, v in store.items()}
+
+
+def capture_snapshot(users_db, questions, reputation, reactions):
+    """
+    Point-in-time copy of every store. Call this on the event loop so no
+    command can modify the data halfway through; it only copies references
+    and never touches disk.
+    """
+    snippet_files = []
+    if os.path.isdir(SNIPPET_DIR):
+        # Snippets are immutable once written, so listing them pins their state
+        snippet_files = sorted(f for f in os.listdir(SNIPPET_DIR) if f.endswith('.zlib'))
+
+    return {
+        'stores': {
+            'user_data.json': dump_records(users_db),
+            'questions.json': _copy_records(questions),
+            'reputation.json': _copy_records(reputation),
+            'reactions.json': reactions,
+        },
+        'snippets': snippet_files,
+        'taken_at': time.time(),
+    }
+
+
+def _add_json(tar, name, data, mtime):
+    # Encode in chunks into a spooled buffer, since tar needs the size up front
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_LIMIT) as buf:
+        for chunk in json.JSONEncoder().iterencode(data):
+            buf.write(chunk.encode('utf-8'))
+        info = tarfile.TarInfo(name)
+        info.size = buf.tell()
+        info.mtime = mtime
+        buf.seek(0)
+        tar.addfile(info, buf)
+
+
+def write_archive(snapshot, path):
+    """Stream a snapshot into a gzip tarball (blocking; run it in a thread)"""
+    # Unique temp name, so two backups started in the same second can't collide
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    mtime = int(snapshot['taken_at'])
+    try:
+        with os.fdopen(fd, 'wb') as raw, tarfile.open(fileobj=raw, mode='w:gz') as tar:
+            for name, data in snapshot['stores'].items():
+                _add_json(tar, name, data, mtime)
+            for filename in snapshot['snippets']:
+                tar.add(os.path.join(SNIPPET_DIR, filename), arcname=f"{SNIPPET_DIR}/{filename}")
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return path
+
+
+def list_backups():
+    """Archive names, oldest first"""
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    return sorted(f for f in os.listdir(BACKUP_DIR) if f.startswith('backup-') and f.endswith('.tar.gz'))
+
+
+def rotate_backups(keep=KEEP_BACKUPS):
+    for name in list_backups()[:-keep]:
+        os.remove(os.path.join(BACKUP_DIR, name))
+
+
+async def create_backup(users_db, questions, reputation, reactions, directory=BACKUP_DIR, rotate=True):
+    """Snapshot all stores and archive them without blocking the event loop"""
+    snapshot = capture_snapshot(users_db, questions, reputation, reactions)
+    os.makedirs(directory, exist_ok=True)
+    # Microseconds keep names unique when two backups start in the same second
+    stamp = datetime.fromtimestamp(snapshot['taken_at'], IST).strftime('%Y%m%d-%H%M%S-%f')
+    path = os.path.join(directory, f"backup-{stamp}.tar.gz")
+
+    await asyncio.to_thread(write_archive, snapshot, path)
+    if rotate:
+        await asyncio.to_thread(rotate_backups)
+    return path
+
+
+def read_archive(path):
+    """Load stores from an archive and put back any missing snippet files (blocking)"""
+    stores = {}
+    with tarfile.open(path, 'r:gz') as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            if member.name in ('user_data.json', 'questions.json', 'reputation.json', 'reactions.json'):
+                stores[member.name] = json.load(tar.extractfile(member))
+            elif member.name.startswith(f"{SNIPPET_DIR}/") and member.name.endswith('.zlib'):
+                target = os.path.join(SNIPPET_DIR, os.path.basename(member.name))
+                # Content-addressed: an existing file already has the same bytes
+                if not os.path.exists(target):
+                    os.makedirs(SNIPPET_DIR, exist_ok=True)
+                    with open(target, 'wb') as f:
+                        f.write(tar.extractfile(member).read())
+    return stores
+
+
+async def load_backup(name):
+    """Read a named backup from BACKUP_DIR; None if it doesn't exist"""
+    if name not in list_backups():
+        return None
+    return await asyncio.to_thread(read_archive, os.path.join(BACKUP_DIR, name))
@@ -0,0 +1,149 @@
+"""
+Compares the per-user day-boundary/streak loop against streaks.evaluate_activity.
+
+    python bench_streaks.py
+"""
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from streaks import (CALENDAR_OFFSET_SECONDS, IST_OFFSET_SECONDS, STREAK_WINDOW_DAYS, calendar_activity,
+                     evaluate_activity, pack_submissions)
+
+DAY = 86400
+
+
+def day_timestamps(now, offset, days_ago, per_day):
+    """per_day submissions at random times on the local day `days_ago` days before today"""
+    local_midnight = (now + offset) // DAY * DAY - offset
+    start = local_midnight - days_ago * DAY
+    return [start + random.randrange(DAY) for _ in range(per_day)]
+
+
+def make_users(n, now):
+    """
+    Calendar-like activity: a run of consecutive days (sometimes longer than the
+    streak window) ending today, yesterday or earlier, several submissions on
+    some days, a few scattered older days and a few non-IST offsets
+    """
+    timestamp_lists, offsets = [], []
+    for _ in range(n):
+        offset = random.choice([IST_OFFSET_SECONDS] * 8 + [0, -5 * 3600])
+        length = random.choice([random.randint(0, 15)] * 7 + [random.randint(15, 100)] * 2
+                               + [random.randint(100, 500)])
+        end = random.choice([0, 0, 1, 2])
+        timestamps = []
+        for days_ago in range(end, end + length):
+            timestamps += day_timestamps(now, offset, days_ago, random.randint(1, 3))
+        for _ in range(random.randint(0, 5)):
+            timestamps += day_timestamps(now, offset, random.randint(0, 400), 1)
+        timestamp_lists.append(timestamps)
+        offsets.append(offset)
+    return timestamp_lists, offsets
+
+
+def per_user_loop(timestamp_lists, offsets, now):
+    # The get_user_stats approach: per-user "now", per-submission datetime conversion.
+    # Follows each streak to its real end, with no window.
+    solved_today, streaks = [], []
+    for timestamps, offset in zip(timestamp_lists, offsets):
+        tz = timezone(timedelta(seconds=offset))
+        today = datetime.fromtimestamp(now, tz).date()
+        active_days = {datetime.fromtimestamp(ts, tz).date() for ts in timestamps}
+
+        solved = today in active_days
+        day = today if solved else today - timedelta(days=1)
+        streak = 0
+        while day in active_days:
+            streak += 1
+            day -= timedelta(days=1)
+        solved_today.append(solved)
+        streaks.append(streak)
+    return solved_today, streaks
+
+
+def vectorized(timestamp_lists, offsets, now):
+    user_index, timestamps = pack_submissions(timestamp_lists)
+    result = evaluate_activity(user_index, timestamps, np.asarray(offsets), now)
+    return result['solved_today'], result['streak'], result['streak_capped']
+
+
+def check_matches(timestamp_lists, offsets, now, evaluated_lists=None):
+    """
+    Streaks agree exactly inside the window and are flagged as capped beyond it.
+    The reference always sees the raw submissions; evaluated_lists (if given) is
+    what evaluate_activity sees instead, e.g. the merged calendar activity.
+    """
+    loop_solved, loop_streaks = per_user_loop(timestamp_lists, offsets, now)
+    vec_solved, vec_streaks, vec_capped = vectorized(evaluated_lists or timestamp_lists, offsets, now)
+    assert list(vec_solved) == loop_solved
+    for solved, full, streak, capped in zip(loop_solved, loop_streaks, vec_streaks, vec_capped):
+        limit = STREAK_WINDOW_DAYS - (0 if solved else 1)
+        assert streak == min(full, limit) and capped == (full >= limit), (full, streak, capped)
+
+
+def check_examples(now):
+    # 3 submissions a day for 40 days, and a plain 100-day streak ending yesterday
+    offsets = [IST_OFFSET_SECONDS, IST_OFFSET_SECONDS]
+    timestamp_lists = [
+        [ts for days_ago in range(40) for ts in day_timestamps(now, offsets[0], days_ago, 3)],
+        [ts for days_ago in range(1, 101) for ts in day_timestamps(now, offsets[1], days_ago, 1)],
+    ]
+    _, streaks, capped = vectorized(timestamp_lists, offsets, now)
+    assert list(streaks) == [40, 100] and not capped.any()
+
+
+def as_leetcode_reports(timestamp_lists, recent=20):
+    """What get_user_stats merges: the UTC-day submission calendar plus the latest submissions"""
+    return [
+        calendar_activity(Counter(str(ts // DAY * DAY) for ts in timestamps), sorted(timestamps)[-recent:])
+        for timestamps in timestamp_lists
+    ]
+
+
+def check_calendar_merge(now):
+    # Submissions between 00:00 and 05:30 IST fall on the previous UTC day; the calendar
+    # and the exact timestamps must agree on that day, not mark two days active
+    oct_18 = int(datetime(2026, 10, 18, 12, tzinfo=timezone.utc).timestamp())
+    ist = timezone(timedelta(seconds=IST_OFFSET_SECONDS))
+    early = [int(datetime(2026, 10, day, 1, tzinfo=ist).timestamp()) for day in (10, 12, 14, 16, 18)]
+    offsets = [CALENDAR_OFFSET_SECONDS] * 2
+    _, streaks, _ = vectorized(as_leetcode_reports([early, early[-1:]]), offsets, oct_18)
+    assert list(streaks) == [1, 1], list(streaks)
+
+    # Random histories: merged reports must match the raw submissions on UTC days
+    timestamp_lists, _ = make_users(2_000, now)
+    offsets = [CALENDAR_OFFSET_SECONDS] * len(timestamp_lists)
+    check_matches(timestamp_lists, offsets, now, as_leetcode_reports(timestamp_lists))
+
+
+def best_of(fn, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    random.seed(7)
+    now = int(time.time())
+    check_examples(now)
+    check_calendar_merge(now)
+    for n in (1_000, 50_000):
+        timestamp_lists, offsets = make_users(n, now)
+
+        check_matches(timestamp_lists, offsets, now)
+
+        loop_time = best_of(per_user_loop, timestamp_lists, offsets, now)
+        vec_time = best_of(vectorized, timestamp_lists, offsets, now)
+        print(f"{n:>6} users | per-user loop {loop_time * 1000:8.1f} ms | "
+              f"vectorized {vec_time * 1000:7.1f} ms ({loop_time / vec_time:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Compares nested dicts against UserRecord for the in-memory user database.
+
+    python bench_user_records.py
+"""
+import gc
+import random
+import time
+import tracemalloc
+
+from user_records import load_records
+
+
+def make_json(n):
+    """Fake user_data.json content with a sprinkling of legacy string entries"""
+    data = {}
+    for i in range(n):
+        discord_id = str(10**17 + i)
+        if i % 50 == 0:
+            data[discord_id] = f"user{i}"
+            continue
+        easy, med, hard = random.randint(0, 500), random.randint(0, 800), random.randint(0, 200)
+        data[discord_id] = {
+            'leetcode_username': f"user{i}",
+            'registered_date': '2026-01-17T11:25:05.084986',
+            'total_solved': easy + med + hard,
+            'breakdown': [easy, med, hard],
+            'last_status': random.random() < 0.4
+        }
+    return data
+
+
+def measure_memory(build):
+    gc.collect()
+    tracemalloc.start()
+    db = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return db, size
+
+
+def iterate_dicts(db):
+    # What the old code did on every pass: re-normalize, then read via .get()
+    solved = active = 0
+    for discord_id, info in db.items():
+        if isinstance(info, str):
+            info = {'leetcode_username': info}
+        solved += info.get('total_solved', 0)
+        active += 1 if info.get('last_status') else 0
+    return solved, active
+
+
+def iterate_records(db):
+    solved = active = 0
+    for record in db.values():
+        solved += record.total_solved
+        active += 1 if record.last_status else 0
+    return solved, active
+
+
+def best_of(fn, db, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(db)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    random.seed(42)
+    for n in (10_000, 100_000):
+        raw = make_json(n)
+        # Copy via the builder so tracemalloc only sees the structure under test
+        dict_db, dict_bytes = measure_memory(
+            lambda: {k: (dict(v, breakdown=list(v['breakdown'])) if isinstance(v, dict) else v) for k, v in raw.items()}
+        )
+        record_db, record_bytes = measure_memory(lambda: load_records(raw))
+        assert iterate_dicts(dict_db) == iterate_records(record_db)
+
+        dict_time = best_of(iterate_dicts, dict_db)
+        record_time = best_of(iterate_records, record_db)
+        print(f"{n:>7} users | memory: dicts {dict_bytes / 2**20:6.1f} MiB, "
+              f"records {record_bytes / 2**20:6.1f} MiB ({record_bytes / dict_bytes:.0%}) | "
+              f"iterate: dicts {dict_time * 1000:6.1f} ms, records {record_time * 1000:6.1f} ms "
+              f"({dict_time / record_time:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
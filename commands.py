@@ -1,11 +1,19 @@
 import discord
+import asyncio
 from datetime import datetime
-from leetcode_buddy import get_user_stats
+from live_updates import publish_user
+from community_stats import community_stats
+from user_records import UserRecord
+from sync_queue import fetch_directly, request_sync, result_to_stats
+
+# How long !register waits on the sync worker before checking LeetCode itself
+REGISTER_WAIT_SECONDS = 10
 
 class UserCommands:
-    def __init__(self, users_db, save_callback):
+    def __init__(self, users_db, save_callback, sync_queue):
         self.users_db = users_db
         self.save_callback = save_callback
+        self.sync_queue = sync_queue
 
     async def register_user(self, message):
         """Link a LeetCode account to Discord"""
@@ -19,21 +27,30 @@ class UserCommands:
         
         # 1. Verify user exists via API
         msg = await message.channel.send(f"🔍 Verifying user `{username}`...")
-        stats = get_user_stats(username)
+        # Jump the sync worker's queue; this also adds the user to its rolling schedule
+        result = await request_sync(self.sync_queue, discord_id, username, REGISTER_WAIT_SECONDS)
+        if result is not None:
+            stats = result_to_stats(result)
+        else:
+            stats = await fetch_directly(self.sync_queue, discord_id, username)
         
         if not stats:
+            # Don't leave the misspelled name on the worker's schedule
+            if discord_id in self.users_db:
+                await asyncio.to_thread(self.sync_queue.enqueue, discord_id, self.users_db[discord_id].leetcode_username)
+            else:
+                await asyncio.to_thread(self.sync_queue.remove, discord_id)
             await msg.edit(content=f"❌ **Error:** Could not find LeetCode user `{username}`. Check the spelling.")
             return
         
         # 2. Save data with full stats
-        self.users_db[discord_id] = {
-            'leetcode_username': username,
-            'registered_date': datetime.now().isoformat(),
-            'total_solved': stats['total_solved'],
-            'breakdown': stats['breakdown'],
-            'last_status': stats['solved_today']
-        }
+        previous = self.users_db.get(discord_id)
+        record = UserRecord(leetcode_username=username, registered_date=datetime.now().isoformat())
+        record.apply_stats(stats)
+        self.users_db[discord_id] = record
         self.save_callback()
+        community_stats.apply(previous, record)
+        publish_user(discord_id, record)
         
         await msg.edit(content=f"✅ **Success!** Registered `{username}`.\nCheck your stats with `!mystatus`.")
 
@@ -41,9 +58,12 @@ class UserCommands:
         """Remove user from database"""
         discord_id = str(message.author.id)
         if discord_id in self.users_db:
-            username = self.users_db[discord_id].get('leetcode_username', 'Unknown')
-            del self.users_db[discord_id]
+            previous = self.users_db.pop(discord_id)
+            username = previous.leetcode_username
             self.save_callback()
+            await asyncio.to_thread(self.sync_queue.remove, discord_id)
+            community_stats.apply(previous, None)
+            publish_user(discord_id, None)
             await message.channel.send(f"🗑️ Unregistered account `{username}`.")
         else:
             await message.channel.send("⚠️ You are not currently registered.")
@@ -56,14 +76,15 @@ class UserCommands:
             return
 
         data = self.users_db[discord_id]
-        status_emoji = "✅ Completed" if data.get('last_status') else "❌ Pending"
+        status_emoji = "✅ Completed" if data.last_status else "❌ Pending"
         
-        embed = discord.Embed(title=f"👤 {data['leetcode_username']}", color=0x00ff00)
+        embed = discord.Embed(title=f"👤 {data.leetcode_username}", color=0x00ff00)
         embed.add_field(name="Daily Challenge", value=status_emoji, inline=True)
-        embed.add_field(name="Total Solved", value=str(data.get('total_solved', 0)), inline=True)
+        embed.add_field(name="Total Solved", value=str(data.total_solved), inline=True)
+        embed.add_field(name="Streak", value=f"🔥 {data.streak_label} days", inline=True)
         
         # Breakdown visualization
-        easy, med, hard = data.get('breakdown', [0,0,0])
+        easy, med, hard = data.breakdown
         embed.add_field(name="Breakdown", value=f"🟢 {easy} | 🟡 {med} | 🔴 {hard}", inline=False)
         
         await message.channel.send(embed=embed)
@@ -77,7 +98,7 @@ class UserCommands:
         # Sort users by total_solved
         sorted_users = sorted(
             self.users_db.values(), 
-            key=lambda x: x.get('total_solved', 0), 
+            key=lambda x: x.total_solved, 
             reverse=True
         )
 
@@ -85,9 +106,9 @@ class UserCommands:
         description = ""
         
         for i, user in enumerate(sorted_users[:10], 1):
-            status = "✅" if user.get('last_status') else "⏳"
-            description += f"**{i}. {user['leetcode_username']}**\n"
-            description += f"   {status} Today | 💎 {user.get('total_solved', 0)} Solved\n\n"
+            status = "✅" if user.last_status else "⏳"
+            description += f"**{i}. {user.leetcode_username}**\n"
+            description += f"   {status} Today | 💎 {user.total_solved} Solved\n\n"
             
         embed.description = description
         embed.set_footer(text="See full analytics on the dashboard!")
@@ -107,8 +128,8 @@ class UserCommands:
         embed = discord.Embed(title="📊 Community Progress", color=0x3498db)
         
         for user_data in self.users_db.values():
-            name = user_data['leetcode_username']
-            if user_data.get('last_status'):
+            name = user_data.leetcode_username
+            if user_data.last_status:
                 completed += 1
                 embed.add_field(name=name, value="✅ Done", inline=True)
             else:
@@ -123,15 +144,16 @@ class UserCommands:
             await message.channel.send("⚠️ No data available.")
             return
 
-        total_users = len(self.users_db)
-        # Summing total solved for all users
-        total_solved_combined = sum(u.get('total_solved', 0) for u in self.users_db.values())
-        active_today = sum(1 for u in self.users_db.values() if u.get('last_status'))
+        # Maintained incrementally, so no need to scan every user here
+        stats = community_stats.summary()
+        total_users = stats['members']
+        easy, med, hard = stats['difficulty']
 
         embed = discord.Embed(title="📈 Community Statistics", color=0x9b59b6)
         embed.add_field(name="👥 Members", value=str(total_users), inline=True)
-        embed.add_field(name="🔥 Active Today", value=f"{active_today}/{total_users}", inline=True)
-        embed.add_field(name="🧠 Combined Problems Solved", value=str(total_solved_combined), inline=False)
+        embed.add_field(name="🔥 Active Today", value=f"{stats['active_today']}/{total_users}", inline=True)
+        embed.add_field(name="🧠 Combined Problems Solved", value=str(stats['total_solved']), inline=False)
+        embed.add_field(name="Breakdown", value=f"🟢 {easy} | 🟡 {med} | 🔴 {hard}", inline=False)
         
         await message.channel.send(embed=embed)
 
@@ -159,6 +181,7 @@ class UserCommands:
             "`!ask <question>` - Post a question\n"
             "`!solve <id>` - Mark question solved\n"
             "`!code <lang> <code>` - Share formatted code\n"
+            "`!snippet <id>` - View a shared snippet\n"
             "`!questions` - View open questions\n"
             "`!helpme` - Detailed help system guide"
         ), inline=False)
@@ -0,0 +1,91 @@
+import bisect
+import threading
+
+# Lower bounds of the total-solved distribution buckets shown on the dashboard
+SOLVED_BUCKETS = [0, 50, 100, 250, 500, 1000]
+BUCKET_LABELS = ['0-49', '50-99', '100-249', '250-499', '500-999', '1000+']
+
+
+def _contribution(record):
+    """(active, solved, [easy, med, hard], bucket) that one UserRecord adds to the totals"""
+    if record is None:
+        return None
+    bucket = bisect.bisect_right(SOLVED_BUCKETS, record.total_solved) - 1
+    active = 1 if record.last_status else 0
+    return (active, record.total_solved, record.breakdown, max(bucket, 0))
+
+
+class CommunityStats:
+    """
+    Running community totals, updated by deltas whenever a user record changes
+    so !stats and the dashboard can read them without scanning every user.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.members = 0
+        self.active_today = 0
+        self.total_solved = 0
+        self.difficulty = [0, 0, 0]  # [Easy, Med, Hard]
+        self.distribution = [0] * len(SOLVED_BUCKETS)
+
+    def _add(self, contribution, sign):
+        active, solved, breakdown, bucket = contribution
+        self.members += sign
+        self.active_today += sign * active
+        self.total_solved += sign * solved
+        for i in range(3):
+            self.difficulty[i] += sign * breakdown[i]
+        self.distribution[bucket] += sign
+
+    def apply(self, old_record, new_record):
+        """Replace one user's old contribution with the new one (either may be None)"""
+        old = _contribution(old_record)
+        new = _contribution(new_record)
+        with self.lock:
+            if old is not None:
+                self._add(old, -1)
+            if new is not None:
+                self._add(new, 1)
+
+    def rebuild(self, users_db):
+        """Full recompute from scratch"""
+        fresh = CommunityStats()
+        for record in users_db.values():
+            fresh._add(_contribution(record), 1)
+        with self.lock:
+            self.members = fresh.members
+            self.active_today = fresh.active_today
+            self.total_solved = fresh.total_solved
+            self.difficulty = fresh.difficulty
+            self.distribution = fresh.distribution
+
+    def verify(self, users_db):
+        """Compare the running totals with a full recompute; fix and report any drift"""
+        fresh = CommunityStats()
+        fresh.rebuild(users_db)
+        expected = fresh.summary()
+        actual = self.summary()
+        if expected == actual:
+            return True
+
+        drift = {k: (actual[k], expected[k]) for k in expected if actual[k] != expected[k]}
+        print(f"⚠️ Community stats drifted, resetting: {drift}")
+        self.rebuild(users_db)
+        return False
+
+    def summary(self):
+        with self.lock:
+            return {
+                'members': self.members,
+                'active_today': self.active_today,
+                'total_solved': self.total_solved,
+                'difficulty': list(self.difficulty),
+                'distribution': list(self.distribution),
+                'buckets': BUCKET_LABELS,
+            }
+
+
+community_stats = CommunityStats()
@@ -0,0 +1,75 @@
+import datetime
+import threading
+import time
+import requests
+import pytz
+
+LEETCODE_URL = "https://leetcode.com/graphql"
+# Don't hammer LeetCode if the daily lookup fails or hasn't rotated yet
+RETRY_SECONDS = 300
+
+# LeetCode rotates the daily problem at 00:00 UTC (05:30 IST)
+DAILY_QUERY = """
+query questionOfToday {
+    activeDailyCodingChallengeQuestion {
+        date
+        question {
+            titleSlug
+            title
+        }
+    }
+}
+"""
+
+_lock = threading.Lock()
+_cache = {'date': None, 'slug': None, 'title': None}
+_next_attempt = 0.0
+
+
+def _utc_today():
+    return datetime.datetime.now(pytz.utc).date()
+
+
+def get_daily_challenge():
+    """
+    Returns { 'date': date, 'slug': str, 'title': str } for today's daily problem.
+    Only one request is made per challenge day; None if LeetCode can't be reached.
+    """
+    global _next_attempt
+    today = _utc_today()
+    with _lock:
+        if _cache['date'] == today or time.time() < _next_attempt:
+            return dict(_cache) if _cache['date'] == today else None
+
+        _next_attempt = time.time() + RETRY_SECONDS
+        try:
+            response = requests.post(LEETCODE_URL, json={'query': DAILY_QUERY}, timeout=10)
+            challenge = response.json()['data']['activeDailyCodingChallengeQuestion']
+            _cache['date'] = datetime.date.fromisoformat(challenge['date'])
+            _cache['slug'] = challenge['question']['titleSlug']
+            _cache['title'] = challenge['question']['title']
+        except Exception as e:
+            print(f"Daily challenge fetch error: {e}")
+            return None
+
+        return dict(_cache) if _cache['date'] == today else None
+
+
+def challenge_start_timestamp(challenge):
+    """Unix timestamp at which the given daily challenge went live"""
+    start = datetime.datetime.combine(challenge['date'], datetime.time(0, 0), tzinfo=pytz.utc)
+    return int(start.timestamp())
+
+
+def today_start_timestamp():
+    """Unix timestamp at which today's daily challenge went live"""
+    return challenge_start_timestamp({'date': _utc_today()})
+
+
+def solved_daily(recent_ac, challenge):
+    """True if any recent accepted submission is the daily problem, submitted since it went live"""
+    start = challenge_start_timestamp(challenge)
+    return any(
+        sub['titleSlug'] == challenge['slug'] and int(sub['timestamp']) >= start
+        for sub in recent_ac
+    )
@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+# How often the event-loop lag probe wakes up
+LAG_PROBE_SECONDS = 1.0
+# Above this the loop is considered too busy to serve commands
+MAX_LOOP_LAG_SECONDS = 2.0
+# /healthz fails once the lag probe has been silent this long (loop is stuck)
+HEARTBEAT_TIMEOUT_SECONDS = 30
+
+
+class HealthState:
+    """
+    In-memory process health, written by the bot and read by /healthz and
+    /readyz. Every value is a plain attribute, so reads never touch disk.
+    """
+    def __init__(self):
+        self.started_at = time.time()
+        self.gateway_connected = False
+        self.gateway_changed_at = None
+        self.loop_lag = 0.0
+        self.loop_heartbeat = None
+        self.last_sync_at = None
+        self.backlog_sources = {}   # name -> callable returning unsaved item count
+
+    def set_gateway(self, connected):
+        self.gateway_connected = connected
+        self.gateway_changed_at = time.time()
+
+    def mark_synced(self):
+        self.last_sync_at = time.time()
+
+    def add_backlog_source(self, name, count):
+        self.backlog_sources[name] = count
+
+    async def monitor_loop_lag(self):
+        """Measure how late the event loop wakes us up (run as a background task)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_PROBE_SECONDS)
+            self.loop_lag = max(0.0, loop.time() - start - LAG_PROBE_SECONDS)
+            self.loop_heartbeat = time.time()
+
+    def _age(self, timestamp, now):
+        return round(now - timestamp, 1) if timestamp else None
+
+    def liveness(self):
+        """(ok, details) for /healthz: is the event loop still turning?"""
+        now = time.time()
+        heartbeat_age = self._age(self.loop_heartbeat, now)
+        ok = heartbeat_age is not None and heartbeat_age < HEARTBEAT_TIMEOUT_SECONDS
+        return ok, {
+            'status': 'ok' if ok else 'stalled',
+            'uptime_seconds': self._age(self.started_at, now),
+            'loop_heartbeat_age_seconds': heartbeat_age,
+        }
+
+    def readiness(self):
+        """(ok, details) for /readyz: connected to Discord and keeping up?"""
+        now = time.time()
+        alive, _ = self.liveness()
+        backlog = {}
+        for name, count in self.backlog_sources.items():
+            try:
+                backlog[name] = count()
+            except Exception:
+                backlog[name] = None
+
+        ok = alive and self.gateway_connected and self.loop_lag < MAX_LOOP_LAG_SECONDS
+        return ok, {
+            'status': 'ready' if ok else 'not ready',
+            'gateway_connected': self.gateway_connected,
+            'gateway_changed_age_seconds': self._age(self.gateway_changed_at, now),
+            'loop_lag_seconds': round(self.loop_lag, 3),
+            'last_sync_age_seconds': self._age(self.last_sync_at, now),
+            'flush_backlog': backlog,
+        }
+
+
+health = HealthState()
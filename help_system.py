@@ -1,15 +1,46 @@
 import discord
+import io
 import json
 import random
+import bisect
 from datetime import datetime
 
+from snippet_store import SnippetStore
+
+# Reactions that award a helpful point to the message author
+HELPFUL_REACTIONS = {"👍", "✅"}
+# Language mapping for syntax highlighting
+LANG_MAP = {
+    'python': 'py', 'java': 'java', 'cpp': 'cpp',
+    'c++': 'cpp', 'javascript': 'js', 'js': 'js', 'c': 'c'
+}
+LANG_NAMES = {'py': 'Python', 'java': 'Java', 'cpp': 'C++', 'js': 'JavaScript', 'c': 'C'}
+# Discord rejects embed field values longer than this
+EMBED_FIELD_LIMIT = 1024
+
+# Size of the maintained !helpers leaderboard
+TOP_HELPERS = 10
+# Write reputation.json once this many helpers have unsaved changes
+REPUTATION_BATCH_SIZE = 25
+
 class HelpSystem:
     def __init__(self, save_callback):
         self.save_callback = save_callback
         self.questions_file = 'questions.json'
         self.reputation_file = 'reputation.json'
+        self.reactions_file = 'reactions.json'
         self.questions = self.load_questions()
         self.reputation = self.load_reputation()
+        self.snippets = SnippetStore()
+
+        # Helpers whose reputation changed since the last write
+        self.dirty_reputation = set()
+        # Snippet messages and votes persisted in reactions.json, written with reputation
+        self.reactions_dirty = False
+        self.load_reaction_state(self.load_reactions())
+        # Sorted [(-points, user_id)] for the top helpers only
+        self.top_helpers = []
+        self.rebuild_top_helpers()
 
     def load_questions(self):
         try:
@@ -33,6 +64,50 @@ class HelpSystem:
         with open(self.reputation_file, 'w') as f:
             json.dump(self.reputation, f)
 
+    def load_reactions(self):
+        try:
+            with open(self.reactions_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save_reactions(self):
+        with open(self.reactions_file, 'w') as f:
+            json.dump(self.reaction_state(), f)
+
+    def reaction_state(self):
+        """JSON form of the snippet message index and per-reactor votes"""
+        return {
+            'snippet_messages': {str(k): v for k, v in self.snippet_messages.items()},
+            'votes': {f"{m}:{r}": sorted(emojis) for (m, r), emojis in self.reaction_votes.items()}
+        }
+
+    def load_reaction_state(self, state):
+        # message_id -> author_id for snippets (questions keep theirs in questions.json)
+        self.snippet_messages = {int(k): v for k, v in state.get('snippet_messages', {}).items()}
+        # message_id -> author_id for questions and snippets (reaction targets)
+        self.message_index = {
+            q['message_id']: q['author'] for q in self.questions.values() if q.get('message_id')
+        }
+        self.message_index.update(self.snippet_messages)
+        # (message_id, reactor_id) -> helpful emojis that reactor currently has on it
+        self.reaction_votes = {}
+        for key, emojis in state.get('votes', {}).items():
+            message_id, reactor_id = key.split(':')
+            self.reaction_votes[(int(message_id), reactor_id)] = set(emojis)
+
+    def restore_data(self, questions, reputation, reactions):
+        """Replace questions, reputation and votes (e.g. from a backup) and rebuild indexes"""
+        self.questions = questions
+        self.reputation = reputation
+        self.load_reaction_state(reactions)
+        self.rebuild_top_helpers()
+        self.save_questions()
+        self.save_reputation()
+        self.save_reactions()
+        self.dirty_reputation.clear()
+        self.reactions_dirty = False
+
     def generate_question_id(self):
         return f"Q{random.randint(1000, 9999)}"
 
@@ -71,6 +146,7 @@ class HelpSystem:
 
         sent_message = await message.channel.send(embed=embed)
         self.questions[question_id]['message_id'] = sent_message.id
+        self.message_index[sent_message.id] = str(message.author.id)
         
         # Add reaction for easy interaction
         await sent_message.add_reaction("❓")
@@ -125,58 +201,156 @@ class HelpSystem:
         language = content[1].lower()
         code = content[2]
 
-        # Language mapping for syntax highlighting
-        lang_map = {
-            'python': 'py', 'java': 'java', 'cpp': 'cpp', 
-            'c++': 'cpp', 'javascript': 'js', 'js': 'js', 'c': 'c'
-        }
-
-        if language not in lang_map:
+        if language not in LANG_MAP:
             await message.channel.send("**Supported languages:** python, java, cpp, javascript, c")
             return
 
-        code_id = f"C{random.randint(100, 999)}"
-        
+        lang_code = LANG_MAP[language]
+        code_id, created = self.snippets.save(lang_code, code, message.author.id, message.author.display_name)
+
         embed = discord.Embed(
             title=f"Code Snippet {code_id}",
             description=f"Shared by {message.author.mention}",
             color=0x0099ff,
             timestamp=datetime.now()
         )
-        embed.add_field(name="Language", value=language.title(), inline=True)
+        embed.add_field(name="Language", value=LANG_NAMES[lang_code], inline=True)
         embed.add_field(name="ID", value=code_id, inline=True)
-        
-        # Format code with syntax highlighting
-        formatted_code = f"```{lang_map[language]}\n{code}\n```"
-        embed.add_field(name="Code", value=formatted_code, inline=False)
-        embed.set_footer(text="React with 👍 if helpful")
+        embed.set_footer(text="React with 👍 if helpful" if created else "Identical snippet already shared | React with 👍 if helpful")
 
-        sent_message = await message.channel.send(embed=embed)
+        sent_message = await self.send_snippet(message.channel, embed, code_id, lang_code, code)
+        self.message_index[sent_message.id] = str(message.author.id)
+        self.snippet_messages[sent_message.id] = str(message.author.id)
+        self.reactions_dirty = True
         await sent_message.add_reaction("👍")
         await sent_message.add_reaction("🔍")  # For review requests
 
+    async def send_snippet(self, channel, embed, code_id, lang_code, code):
+        """Send code inline when it fits in an embed field, otherwise as a file"""
+        # Format code with syntax highlighting
+        formatted_code = f"```{lang_code}\n{code}\n```"
+        if len(formatted_code) <= EMBED_FIELD_LIMIT:
+            embed.add_field(name="Code", value=formatted_code, inline=False)
+            return await channel.send(embed=embed)
+
+        embed.add_field(name="Code", value="Too long to show inline, see the attached file.", inline=False)
+        attachment = discord.File(io.BytesIO(code.encode('utf-8')), filename=f"{code_id}.{lang_code}")
+        return await channel.send(embed=embed, file=attachment)
+
+    async def show_snippet(self, message):
+        """Look up a previously shared snippet by ID"""
+        content = message.content.split()
+        if len(content) < 2:
+            await message.channel.send("**Usage:** `!snippet <snippet_id>`")
+            return
+
+        code_id = content[1].upper()
+        snippet = self.snippets.get(code_id)
+        if not snippet:
+            await message.channel.send(f"**Error:** Snippet {code_id} not found.")
+            return
+
+        embed = discord.Embed(
+            title=f"Code Snippet {code_id}",
+            description=f"Shared by <@{snippet['author']}>",
+            color=0x0099ff,
+            timestamp=datetime.fromisoformat(snippet['timestamp'])
+        )
+        embed.add_field(name="Language", value=LANG_NAMES.get(snippet['language'], snippet['language']), inline=True)
+        embed.add_field(name="ID", value=code_id, inline=True)
+        await self.send_snippet(message.channel, embed, code_id, snippet['language'], snippet['code'])
+
     async def add_helpful_point(self, user_id):
         """Add reputation point for being helpful"""
+        self.adjust_reputation(user_id, 1)
+
+    def adjust_reputation(self, user_id, delta):
+        """Apply a point change in memory; the file is written in batches"""
         user_id = str(user_id)
         if user_id not in self.reputation:
             self.reputation[user_id] = {'points': 0, 'helped_count': 0}
-        
-        self.reputation[user_id]['points'] += 1
-        self.reputation[user_id]['helped_count'] += 1
-        self.save_reputation()
+
+        self.reputation[user_id]['points'] += delta
+        self.reputation[user_id]['helped_count'] += delta
+        self.update_top_helpers(user_id)
+
+        self.dirty_reputation.add(user_id)
+        if len(self.dirty_reputation) >= REPUTATION_BATCH_SIZE:
+            self.flush_reputation()
+
+    def flush_reputation(self):
+        """Persist pending reputation changes (called by the batch limit and a timer)"""
+        if self.dirty_reputation:
+            self.save_reputation()
+            self.dirty_reputation.clear()
+        # Votes go out in the same flush so a restart can't let a reactor count twice
+        if self.reactions_dirty:
+            self.save_reactions()
+            self.reactions_dirty = False
+
+    def rebuild_top_helpers(self):
+        ranked = sorted((-data['points'], user_id) for user_id, data in self.reputation.items())
+        self.top_helpers = ranked[:TOP_HELPERS]
+
+    def update_top_helpers(self, user_id):
+        """Keep the top-K list current after one helper's points changed"""
+        points = self.reputation[user_id]['points']
+        # Everyone outside a full top-K has at most this many points
+        floor = -self.top_helpers[-1][0] if len(self.top_helpers) == TOP_HELPERS else None
+        others = [entry for entry in self.top_helpers if entry[1] != user_id]
+
+        if len(others) == len(self.top_helpers):
+            # Not on the board yet; only enter if they beat the cut-off
+            if floor is not None and points <= floor:
+                return
+        elif floor is not None and points < floor:
+            # Dropped below the cut-off, so someone outside may now outrank them
+            self.rebuild_top_helpers()
+            return
+
+        bisect.insort(others, (-points, user_id))
+        self.top_helpers = others[:TOP_HELPERS]
+
+    async def handle_reaction(self, payload, added):
+        """Award or revoke a helpful point when someone reacts to a question or snippet"""
+        emoji = str(payload.emoji)
+        if emoji not in HELPFUL_REACTIONS:
+            return
+
+        author_id = self.message_index.get(payload.message_id)
+        reactor_id = str(payload.user_id)
+        if author_id is None or author_id == reactor_id:
+            return
+
+        # One point per reactor per message, however many helpful emojis they use
+        key = (payload.message_id, reactor_id)
+        emojis = self.reaction_votes.get(key, set())
+        had_vote = bool(emojis)
+
+        if added:
+            emojis.add(emoji)
+            self.reaction_votes[key] = emojis
+        else:
+            emojis.discard(emoji)
+            if not emojis:
+                self.reaction_votes.pop(key, None)
+        self.reactions_dirty = True
+
+        if added and not had_vote:
+            self.adjust_reputation(author_id, 1)
+        elif not added and had_vote and not emojis:
+            self.adjust_reputation(author_id, -1)
 
     async def show_helpers(self, message):
         """Show top helpers leaderboard"""
-        if not self.reputation:
+        if not self.top_helpers:
             await message.channel.send("**No helpers yet!** Start helping others to earn points.")
             return
 
-        # Sort by points
-        sorted_helpers = sorted(self.reputation.items(), key=lambda x: x[1]['points'], reverse=True)
-        
         embed = discord.Embed(title="Top Helpers", color=0xffd700)
         
-        for i, (user_id, data) in enumerate(sorted_helpers[:10], 1):
+        for i, (_, user_id) in enumerate(self.top_helpers, 1):
+            data = self.reputation[user_id]
             points = data['points']
             helped = data['helped_count']
             embed.add_field(
@@ -217,6 +391,7 @@ class HelpSystem:
             ("!ask <question>", "Post a new question"),
             ("!solve <question_id>", "Mark your question as solved"),
             ("!code <language> <code>", "Share formatted code"),
+            ("!snippet <snippet_id>", "View a shared code snippet"),
             ("!questions", "View open questions"),
             ("!helpers", "View top helpers"),
             ("!helpme", "Show these commands")
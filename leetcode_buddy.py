@@ -1,17 +1,27 @@
 import datetime
+import json
 import requests
 import pytz
 
+from daily_challenge import get_daily_challenge, solved_daily
+from streaks import calendar_activity
+
 LEETCODE_URL = "https://leetcode.com/graphql"
 IST = pytz.timezone('Asia/Kolkata')
+# How many recent accepted submissions to scan for the daily problem
+RECENT_AC_LIMIT = 20
 
 def get_user_stats(username):
     """
-    Fetches detailed stats: { 'solved_today': bool, 'total_solved': int, 'breakdown': [easy, med, hard] }
+    Fetches detailed stats: { 'solved_today': bool, 'total_solved': int, 'breakdown': [easy, med, hard],
+    'activity_timestamps': [int, ...] }
     """
     query = """
-    query getUserProfile($username: String!) {
+    query getUserProfile($username: String!, $limit: Int!) {
         matchedUser(username: $username) {
+            userCalendar {
+                submissionCalendar
+            }
             submitStats {
                 acSubmissionNum {
                     difficulty
@@ -19,13 +29,13 @@ def get_user_stats(username):
                 }
             }
         }
-        recentSubmissionList(username: $username, limit: 1) {
+        recentAcSubmissionList(username: $username, limit: $limit) {
+            titleSlug
             timestamp
-            statusDisplay
         }
     }
     """
-    variables = {'username': username}
+    variables = {'username': username, 'limit': RECENT_AC_LIMIT}
 
     try:
         response = requests.post(LEETCODE_URL, json={'query': query, 'variables': variables}, timeout=10)
@@ -42,22 +52,34 @@ def get_user_stats(username):
         hard = next((item['count'] for item in stats if item['difficulty'] == 'Hard'), 0)
 
         # 2. Check Daily Status
-        solved_today = False
-        recent = data['data']['recentSubmissionList']
-        if recent:
-            submission = recent[0]
-            utc_time = datetime.datetime.fromtimestamp(int(submission['timestamp']), pytz.utc)
-            submission_ist = utc_time.astimezone(IST)
-            now_ist = datetime.datetime.now(IST)
-            
-            # Check if submission was today (IST) and Accepted
-            if submission_ist.date() == now_ist.date() and submission['statusDisplay'] == 'Accepted':
-                solved_today = True
+        recent_ac = data['data']['recentAcSubmissionList'] or []
+        challenge = get_daily_challenge()
+
+        if challenge:
+            # Solved only if the daily problem itself was accepted since it went live
+            solved_today = solved_daily(recent_ac, challenge)
+        else:
+            # Fallback: any accepted submission today (IST)
+            today_ist = datetime.datetime.now(IST).date()
+            solved_today = any(
+                datetime.datetime.fromtimestamp(int(sub['timestamp']), pytz.utc).astimezone(IST).date() == today_ist
+                for sub in recent_ac
+            )
+
+        # 3. Day-level activity for streaks: the past year's submission calendar
+        # plus the recent accepted submissions, both on UTC days
+        calendar = data['data']['matchedUser'].get('userCalendar') or {}
+        activity = calendar_activity(
+            json.loads(calendar.get('submissionCalendar') or '{}'),
+            (sub['timestamp'] for sub in recent_ac)
+        )
 
         return {
             "solved_today": solved_today,
             "total_solved": total_solved,
-            "breakdown": [easy, medium, hard]
+            "breakdown": [easy, medium, hard],
+            # Fed to streaks.evaluate_activity in batches
+            "activity_timestamps": activity
         }
     
     except Exception as e:
@@ -0,0 +1,133 @@
+import json
+import queue
+import threading
+
+from community_stats import community_stats
+
+# How many pending events a single viewer may fall behind before it is resynced
+CLIENT_BACKLOG = 256
+# Seconds between keep-alive comments so proxies don't drop idle streams
+HEARTBEAT_SECONDS = 15
+
+
+def user_card(discord_id, record):
+    """Convert a UserRecord into the shape the dashboard renders"""
+    return {
+        'username': record.leetcode_username,
+        'solved': record.total_solved,
+        'breakdown': record.breakdown,  # [Easy, Med, Hard]
+        'discord_id': discord_id,
+        'status': record.last_status,
+        'streak': record.streak,
+        'streak_capped': record.streak_capped
+    }
+
+
+class Broadcaster:
+    """
+    Fans out dashboard diffs to every connected SSE viewer.
+    Each update is encoded once and the same frame is handed to all viewers,
+    so the cost of a change does not grow with the size of the database.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clients = set()
+        self.cards = {}     # discord_id -> last card sent to viewers
+        self.stats = None   # last community summary sent to viewers
+        self.event_id = 0
+
+    def seed(self, cards, stats=None):
+        """Set the baseline that future diffs are computed against"""
+        with self.lock:
+            self.cards = dict(cards)
+            self.stats = stats
+
+    def subscribe(self):
+        client = queue.Queue(maxsize=CLIENT_BACKLOG)
+        with self.lock:
+            self.clients.add(client)
+        return client
+
+    def unsubscribe(self, client):
+        with self.lock:
+            self.clients.discard(client)
+
+    def publish(self, discord_id, card):
+        """Push only the fields that changed for one user (card=None means removed)"""
+        with self.lock:
+            previous = self.cards.get(discord_id)
+            if card is None:
+                if previous is None:
+                    return
+                del self.cards[discord_id]
+                payload = {'discord_id': discord_id, 'removed': True}
+            elif previous is None:
+                self.cards[discord_id] = card
+                payload = {'discord_id': discord_id, 'new': True, 'changes': card}
+            else:
+                changes = {k: v for k, v in card.items() if previous.get(k) != v}
+                if not changes:
+                    return
+                self.cards[discord_id] = card
+                payload = {'discord_id': discord_id, 'changes': changes}
+
+            self._broadcast('user', payload)
+
+    def publish_stats(self, stats):
+        """Push the community headline numbers if they changed"""
+        with self.lock:
+            if stats == self.stats:
+                return
+            self.stats = stats
+            self._broadcast('stats', stats)
+
+    def _broadcast(self, event, payload):
+        # Caller holds self.lock
+        self.event_id += 1
+        frame = f"id: {self.event_id}\nevent: {event}\ndata: {json.dumps(payload)}\n\n"
+        for client in self.clients:
+            try:
+                client.put_nowait(frame)
+            except queue.Full:
+                # Viewer is too far behind: drop its backlog and send a full resync
+                self._reset_client(client)
+
+    def _reset_client(self, client):
+        try:
+            while True:
+                client.get_nowait()
+        except queue.Empty:
+            pass
+        client.put_nowait(None)
+
+    def snapshot_frame(self):
+        with self.lock:
+            data = json.dumps({'users': list(self.cards.values()), 'stats': self.stats})
+            return f"id: {self.event_id}\nevent: snapshot\ndata: {data}\n\n"
+
+    def stream(self, since=None):
+        """Generator of SSE frames for one viewer"""
+        client = self.subscribe()
+        try:
+            # The viewer may have missed diffs since its page was rendered; resync it
+            if since is None or str(since) != str(self.event_id):
+                yield self.snapshot_frame()
+            while True:
+                try:
+                    frame = client.get(timeout=HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield self.snapshot_frame() if frame is None else frame
+        finally:
+            self.unsubscribe(client)
+
+
+broadcaster = Broadcaster()
+
+
+def publish_user(discord_id, record):
+    """Notify dashboard viewers that a user record was added, changed or removed"""
+    card = user_card(discord_id, record) if record is not None else None
+    broadcaster.publish(discord_id, card)
+    broadcaster.publish_stats(community_stats.summary())
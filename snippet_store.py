@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+
+SNIPPET_DIR = 'snippets'
+# Hex digits of the content hash used in the public ID (C + 10 hex chars)
+ID_LENGTH = 10
+# Snippets kept decompressed in memory for !snippet lookups
+CACHE_SIZE = 128
+
+SNIPPET_ID_PATTERN = re.compile(rf'^C[0-9A-F]{{{ID_LENGTH}}}$')
+
+
+class SnippetStore:
+    """
+    Content-addressed store for shared code.
+    The ID is derived from a hash of the language and code, so reposting the
+    same snippet reuses the existing entry instead of storing a duplicate.
+    Each snippet is one zlib-compressed file, written once and never modified.
+    """
+    def __init__(self, directory=SNIPPET_DIR, cache_size=CACHE_SIZE):
+        self.directory = directory
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def snippet_id(language, code):
+        digest = hashlib.sha256(f"{language}\0{code}".encode('utf-8')).hexdigest()
+        return f"C{digest[:ID_LENGTH].upper()}"
+
+    @staticmethod
+    def is_valid_id(snippet_id):
+        return bool(SNIPPET_ID_PATTERN.match(snippet_id))
+
+    def path_for(self, snippet_id):
+        return os.path.join(self.directory, f"{snippet_id}.zlib")
+
+    def save(self, language, code, author_id, author_name):
+        """Store a snippet. Returns (snippet_id, created); created is False for duplicates"""
+        snippet_id = self.snippet_id(language, code)
+        path = self.path_for(snippet_id)
+        if os.path.exists(path):
+            return snippet_id, False
+
+        snippet = {
+            'language': language,
+            'code': code,
+            'author': str(author_id),
+            'author_name': author_name,
+            'timestamp': datetime.now().isoformat()
+        }
+        # Write to a temp file first so a crash never leaves a truncated snippet
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(zlib.compress(json.dumps(snippet).encode('utf-8')))
+        os.replace(tmp_path, path)
+
+        self._remember(snippet_id, snippet)
+        return snippet_id, True
+
+    def get(self, snippet_id):
+        """Fetch a snippet by ID, serving repeat lookups from the LRU cache"""
+        with self.lock:
+            if snippet_id in self.cache:
+                self.cache.move_to_end(snippet_id)
+                return self.cache[snippet_id]
+
+        if not self.is_valid_id(snippet_id):
+            return None
+        try:
+            with open(self.path_for(snippet_id), 'rb') as f:
+                snippet = json.loads(zlib.decompress(f.read()).decode('utf-8'))
+        except FileNotFoundError:
+            return None
+
+        self._remember(snippet_id, snippet)
+        return snippet
+
+    def _remember(self, snippet_id, snippet):
+        with self.lock:
+            self.cache[snippet_id] = snippet
+            self.cache.move_to_end(snippet_id)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
@@ -0,0 +1,104 @@
+import itertools
+import time
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+# Asia/Kolkata has no DST, so a fixed offset is exact
+IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60
+# Width of the per-day activity matrix (column 0 is today)
+ACTIVITY_DAYS = 30
+# How far back streaks are followed; LeetCode's submission calendar covers the past year
+STREAK_WINDOW_DAYS = 365
+# The submission calendar is keyed by UTC day (as is LeetCode's own streak), so
+# calendar activity must be evaluated with a UTC offset of 0
+CALENDAR_OFFSET_SECONDS = 0
+# Calendar days are reported at noon so they read as the same date at offset 0
+CALENDAR_DAY_MIDPOINT = 12 * 3600
+
+
+def calendar_activity(submission_calendar, extra_timestamps=()):
+    """
+    Merge LeetCode's submissionCalendar ({"<utc midnight>": count}) with exact
+    submission timestamps onto one UTC-day grid: one timestamp per active day.
+    The exact timestamps are snapped to their UTC day rather than added as-is,
+    so a submission shared by both sources can never count as two days.
+    """
+    days = {int(day) // SECONDS_PER_DAY for day, count in submission_calendar.items() if count}
+    days.update(int(ts) // SECONDS_PER_DAY for ts in extra_timestamps)
+    return sorted(day * SECONDS_PER_DAY + CALENDAR_DAY_MIDPOINT for day in days)
+
+
+def pack_submissions(timestamp_lists):
+    """
+    Flatten per-user lists of integer timestamps into the (user_index, timestamps)
+    arrays that evaluate_activity expects. Row i of the output belongs to list i.
+    """
+    counts = np.fromiter(map(len, timestamp_lists), dtype=np.int64, count=len(timestamp_lists))
+    user_index = np.repeat(np.arange(len(timestamp_lists)), counts)
+    timestamps = np.fromiter(
+        itertools.chain.from_iterable(timestamp_lists), dtype=np.int64, count=int(counts.sum())
+    )
+    return user_index, timestamps
+
+
+def evaluate_activity(user_index, timestamps, utc_offsets, now=None, days=ACTIVITY_DAYS,
+                      window=STREAK_WINDOW_DAYS):
+    """
+    One vectorized pass over every user's activity timestamps.
+
+    user_index  -- int array, the user row each timestamp belongs to
+    timestamps  -- int array of Unix seconds, same length as user_index
+    utc_offsets -- int array of seconds east of UTC, one per user
+    now         -- Unix seconds to evaluate at (defaults to the current time)
+
+    Returns { 'solved_today': bool[n], 'activity': int[n, days], 'streak': int[n],
+    'streak_capped': bool[n] }. activity[u, d] counts timestamps d local days ago.
+    A streak is the run of consecutive active days ending today, or ending
+    yesterday while today's problem is still open. It is followed back at most
+    `window` days; streak_capped marks runs that reach that limit, where the
+    data ran out before the streak did.
+    """
+    offsets = np.asarray(utc_offsets, dtype=np.int64)
+    user_index = np.asarray(user_index, dtype=np.int64)
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    n = len(offsets)
+    if now is None:
+        now = int(time.time())
+
+    # Local day numbers: shifting by the offset turns UTC midnights into local ones
+    today = (now + offsets) // SECONDS_PER_DAY
+    days_ago = today[user_index] - (timestamps + offsets[user_index]) // SECONDS_PER_DAY
+    in_window = (days_ago >= 0) & (days_ago < window)
+    users = user_index[in_window]
+    days_ago = days_ago[in_window]
+
+    recent = days_ago < days
+    activity = np.bincount(users[recent] * days + days_ago[recent], minlength=n * days).reshape(n, days)
+
+    # Distinct active (user, day) pairs, sorted by user then most recent day first.
+    # A plain sort and neighbour compare is several times faster than np.unique here.
+    keys = np.sort(users * window + days_ago)
+    keys = keys[np.diff(keys, prepend=-1) != 0]
+    key_users, key_days = keys // window, keys % window
+    group_start = np.searchsorted(key_users, np.arange(n))
+    has_days = np.bincount(key_users, minlength=n) > 0
+
+    # Most recent active day per user (window if none)
+    first_day = np.full(n, window, dtype=np.int64)
+    first_day[has_days] = key_days[group_start[has_days]]
+    solved_today = first_day == 0
+
+    # Within a user's sorted days, day - rank stays equal to the first day for as long
+    # as the days are consecutive, so the run is the count of such entries
+    rank = np.arange(len(keys)) - group_start[key_users]
+    in_run = (key_days - rank) == first_day[key_users]
+    streak = np.bincount(key_users[in_run], minlength=n)
+    streak[first_day > 1] = 0
+    streak_capped = (streak > 0) & (first_day + streak >= window)
+
+    return {
+        'solved_today': solved_today,
+        'activity': activity,
+        'streak': streak,
+        'streak_capped': streak_capped,
+    }
@@ -0,0 +1,285 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from dotenv import load_dotenv
+
+from leetcode_buddy import get_user_stats
+
+load_dotenv()
+
+DB_PATH = 'sync_queue.db'
+# Re-sync each user this often when nothing urgent is queued
+REFRESH_SECONDS = int(os.getenv('SYNC_REFRESH_MINUTES', '60')) * 60
+# Rate budget: minimum seconds between LeetCode requests, for the worker and the bot's fallback
+MIN_REQUEST_INTERVAL = float(os.getenv('SYNC_MIN_INTERVAL', '1.0'))
+URGENT = 0
+ROUTINE = 1
+# A claimed job is hidden from other workers for this long, in case its worker dies
+LEASE_SECONDS = 120
+# Failed fetches retry with exponential backoff, capped at this
+MAX_RETRY_SECONDS = 1800
+# How often the bot polls for the result of an urgent job
+POLL_SECONDS = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    discord_id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    due_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    leased_until REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_next ON jobs (priority, due_at);
+CREATE TABLE IF NOT EXISTS results (
+    discord_id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    found INTEGER NOT NULL,
+    total_solved INTEGER,
+    easy INTEGER,
+    medium INTEGER,
+    hard INTEGER,
+    solved_today INTEGER,
+    synced_at REAL NOT NULL,
+    seq INTEGER NOT NULL,
+    activity TEXT
+);
+CREATE INDEX IF NOT EXISTS results_seq ON results (seq);
+"""
+
+
+def result_to_stats(row):
+    """Convert a results row back into the get_user_stats() shape (None if not found)"""
+    if not row['found']:
+        return None
+    return {
+        'solved_today': bool(row['solved_today']),
+        'total_solved': row['total_solved'],
+        'breakdown': [row['easy'], row['medium'], row['hard']],
+        'activity_timestamps': json.loads(row['activity'] or '[]')
+    }
+
+
+class SyncQueue:
+    """
+    SQLite-backed job queue shared by the bot and the sync worker.
+    `jobs` holds one rolling schedule entry per user; `results` holds the
+    latest stats per user with a sequence number the bot reads forward from.
+    """
+    def __init__(self, path=DB_PATH):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        # Databases created by older versions lack these columns
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(results)")}
+        if 'activity' not in columns:
+            self.conn.execute("ALTER TABLE results ADD COLUMN activity TEXT")
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        if 'leased_until' not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN leased_until REAL NOT NULL DEFAULT 0")
+
+    # --- Bot side ---
+
+    def enqueue(self, discord_id, username, urgent=False):
+        self.enqueue_many([(discord_id, username)], urgent)
+
+    def enqueue_many(self, users, urgent=False):
+        """
+        Schedule [(discord_id, username)], pulling existing jobs forward if urgent.
+        A job another process has leased keeps its lease; it runs again only after that fetch.
+        """
+        priority = URGENT if urgent else ROUTINE
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany(
+                """
+                INSERT INTO jobs (discord_id, username, priority, due_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(discord_id) DO UPDATE SET
+                    username = excluded.username,
+                    priority = MIN(priority, excluded.priority),
+                    due_at = CASE WHEN excluded.priority = 0 THEN MIN(due_at, excluded.due_at) ELSE due_at END
+                """,
+                [(discord_id, username, priority, now) for discord_id, username in users]
+            )
+            self.conn.execute("COMMIT")
+
+    def sync_schedule(self, users):
+        """Make the rolling schedule match {discord_id: username} exactly"""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            existing = {row['discord_id']: row['username'] for row in self.conn.execute("SELECT discord_id, username FROM jobs")}
+            stale = [(discord_id,) for discord_id in existing if discord_id not in users]
+            self.conn.executemany("DELETE FROM jobs WHERE discord_id = ?", stale)
+            # Renamed users keep any active lease so they aren't fetched twice at once
+            self.conn.executemany(
+                """
+                INSERT INTO jobs (discord_id, username, priority, due_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(discord_id) DO UPDATE SET
+                    username = excluded.username, priority = excluded.priority,
+                    due_at = excluded.due_at, attempts = 0
+                """,
+                [(discord_id, username, ROUTINE, time.time())
+                 for discord_id, username in users.items() if existing.get(discord_id) != username]
+            )
+            self.conn.execute("COMMIT")
+
+    def remove(self, discord_id):
+        # Results rows are kept so sequence numbers never go backwards
+        with self.lock:
+            self.conn.execute("DELETE FROM jobs WHERE discord_id = ?", (discord_id,))
+
+    def latest_seq(self):
+        with self.lock:
+            return self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM results").fetchone()[0]
+
+    def is_leased(self, discord_id):
+        """True while some process holds the lease on this user's job"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT leased_until FROM jobs WHERE discord_id = ?", (discord_id,)
+            ).fetchone()
+        return bool(row) and row['leased_until'] > time.time()
+
+    def synced_since(self, timestamp):
+        """{discord_id: username} for users with a successful result written at or after timestamp"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT discord_id, username FROM results WHERE found = 1 AND synced_at >= ?", (timestamp,)
+            ).fetchall()
+        return {row['discord_id']: row['username'] for row in rows}
+
+    def results_since(self, seq):
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM results WHERE seq > ? ORDER BY seq", (seq,)).fetchall()
+        return [dict(row) for row in rows]
+
+    # --- Worker side ---
+
+    def claim(self):
+        """Lease the most pressing due job, or None if nothing is due"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            row = self.conn.execute(
+                "SELECT * FROM jobs WHERE due_at <= ? AND leased_until <= ? ORDER BY priority, due_at LIMIT 1",
+                (now, now)
+            ).fetchone()
+            if row:
+                self.conn.execute(
+                    "UPDATE jobs SET leased_until = ? WHERE discord_id = ?", (now + LEASE_SECONDS, row['discord_id'])
+                )
+            self.conn.execute("COMMIT")
+        return dict(row) if row else None
+
+    def claim_user(self, discord_id):
+        """
+        Lease one user's job for a fetch done outside the worker, so the worker skips it.
+        Returns None if there is no job or another process already holds its lease.
+        """
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            row = self.conn.execute(
+                "SELECT * FROM jobs WHERE discord_id = ? AND leased_until <= ?", (discord_id, now)
+            ).fetchone()
+            if row:
+                self.conn.execute(
+                    "UPDATE jobs SET leased_until = ? WHERE discord_id = ?", (now + LEASE_SECONDS, discord_id)
+                )
+            self.conn.execute("COMMIT")
+        return dict(row) if row else None
+
+    def complete(self, job, stats, refresh_seconds):
+        """Store a fetch result and put the job back on the rolling schedule"""
+        now = time.time()
+        found = stats is not None
+        easy, medium, hard = stats['breakdown'] if found else (None, None, None)
+        if found:
+            attempts, next_due = 0, now + refresh_seconds
+        else:
+            attempts = job['attempts'] + 1
+            next_due = now + min(30 * 2 ** attempts, MAX_RETRY_SECONDS, refresh_seconds)
+
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            # The user may have re-registered with another name while we were fetching
+            current = self.conn.execute(
+                "SELECT username FROM jobs WHERE discord_id = ?", (job['discord_id'],)
+            ).fetchone()
+            if current and current['username'] == job['username']:
+                self.conn.execute(
+                    "UPDATE jobs SET priority = ?, due_at = ?, attempts = ?, leased_until = 0 WHERE discord_id = ?",
+                    (ROUTINE, next_due, attempts, job['discord_id'])
+                )
+            elif current:
+                # Renamed mid-fetch: release the lease so the new name is picked up
+                self.conn.execute("UPDATE jobs SET leased_until = 0 WHERE discord_id = ?", (job['discord_id'],))
+            if current:
+                seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM results").fetchone()[0]
+                self.conn.execute(
+                    """
+                    INSERT OR REPLACE INTO results (discord_id, username, found, total_solved, easy, medium,
+                                                    hard, solved_today, synced_at, seq, activity)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (job['discord_id'], job['username'], int(found),
+                     stats['total_solved'] if found else None, easy, medium, hard,
+                     int(stats['solved_today']) if found else None, now, seq,
+                     json.dumps(stats.get('activity_timestamps', [])) if found else None)
+                )
+            self.conn.execute("COMMIT")
+
+
+async def request_sync(queue, discord_id, username, timeout):
+    """
+    Enqueue an urgent job and wait for the worker to report back.
+    Returns the results row, or None if no worker answered in time.
+    """
+    since = await asyncio.to_thread(queue.latest_seq)
+    await asyncio.to_thread(queue.enqueue, discord_id, username, True)
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(POLL_SECONDS)
+        for row in await asyncio.to_thread(queue.results_since, since):
+            if row['discord_id'] == discord_id and row['username'] == username:
+                return row
+    return None
+
+
+_last_direct_fetch = 0.0
+
+async def fetch_directly(queue, discord_id, username):
+    """
+    Fallback for when no worker answers: take the user's job off the queue,
+    fetch in a thread within MIN_REQUEST_INTERVAL, and record the result as the
+    worker would. Returns get_user_stats() output (None if not found).
+    If a worker holds the job's lease, its result is awaited instead of fetching alongside it.
+    """
+    global _last_direct_fetch
+    since = await asyncio.to_thread(queue.latest_seq)
+    job = await asyncio.to_thread(queue.claim_user, discord_id)
+    while job is None and await asyncio.to_thread(queue.is_leased, discord_id):
+        await asyncio.sleep(POLL_SECONDS)
+        for row in await asyncio.to_thread(queue.results_since, since):
+            if row['discord_id'] == discord_id and row['username'] == username:
+                return result_to_stats(row)
+        job = await asyncio.to_thread(queue.claim_user, discord_id)
+
+    # Shared across every caller in the bot process
+    loop = asyncio.get_running_loop()
+    wait = _last_direct_fetch + MIN_REQUEST_INTERVAL - loop.time()
+    _last_direct_fetch = loop.time() + max(wait, 0)
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+    stats = await asyncio.to_thread(get_user_stats, username)
+    if job and job['username'] == username:
+        await asyncio.to_thread(queue.complete, job, stats, REFRESH_SECONDS)
+    return stats
@@ -0,0 +1,57 @@
+"""
+Background LeetCode sync worker. Run it next to the bot:
+
+    python sync_worker.py [processes]
+
+It keeps every registered user fresh on a rolling schedule, serves urgent
+jobs (new registrations, the daily check) first, and never exceeds the
+request budget below, shared across all of its processes.
+"""
+import sys
+import time
+from multiprocessing import Process
+
+from leetcode_buddy import get_user_stats
+from sync_queue import MIN_REQUEST_INTERVAL, REFRESH_SECONDS, SyncQueue
+
+# Sleep when no job is due
+IDLE_SECONDS = 1
+
+
+def run_worker(request_interval):
+    queue = SyncQueue()
+    last_request = 0.0
+    while True:
+        job = queue.claim()
+        if not job:
+            time.sleep(IDLE_SECONDS)
+            continue
+
+        wait = last_request + request_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        last_request = time.monotonic()
+
+        stats = get_user_stats(job['username'])
+        if not stats:
+            print(f"⚠️ Failed to fetch stats for {job['username']}")
+        queue.complete(job, stats, REFRESH_SECONDS)
+
+
+def main():
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    if processes <= 1:
+        run_worker(MIN_REQUEST_INTERVAL)
+        return
+
+    # Each process gets an equal slice of the request budget
+    workers = [Process(target=run_worker, args=(MIN_REQUEST_INTERVAL * processes,)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    print(f"✅ Sync worker running with {processes} processes")
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+from dataclasses import dataclass, replace
+
+
+@dataclass(slots=True)
+class UserRecord:
+    """
+    One registered member. Loaded and normalized once from user_data.json;
+    slots keep each record far smaller than the equivalent nested dict.
+    """
+    leetcode_username: str
+    registered_date: str = None
+    total_solved: int = 0
+    easy: int = 0
+    medium: int = 0
+    hard: int = 0
+    last_status: bool = False
+    streak: int = 0
+    streak_capped: bool = False  # streak reaches past the available history
+
+    @property
+    def breakdown(self):
+        return [self.easy, self.medium, self.hard]
+
+    @property
+    def streak_label(self):
+        return f"{self.streak}+" if self.streak_capped else str(self.streak)
+
+    @classmethod
+    def from_json(cls, value):
+        # Handle simple string (old format) vs dict (new format)
+        if isinstance(value, str):
+            return cls(leetcode_username=value)
+        easy, medium, hard = value.get('breakdown', [0, 0, 0])
+        return cls(
+            leetcode_username=value.get('leetcode_username', 'Unknown'),
+            registered_date=value.get('registered_date'),
+            total_solved=value.get('total_solved', 0),
+            easy=easy,
+            medium=medium,
+            hard=hard,
+            last_status=value.get('last_status', False),
+            streak=value.get('streak', 0),
+            streak_capped=value.get('streak_capped', False)
+        )
+
+    def to_json(self):
+        data = {
+            'leetcode_username': self.leetcode_username,
+            'total_solved': self.total_solved,
+            'breakdown': self.breakdown,
+            'last_status': self.last_status,
+            'streak': self.streak,
+            'streak_capped': self.streak_capped
+        }
+        if self.registered_date:
+            data['registered_date'] = self.registered_date
+        return data
+
+    def apply_stats(self, stats):
+        """Copy fresh LeetCode stats (from get_user_stats) onto the record"""
+        self.total_solved = stats['total_solved']
+        self.easy, self.medium, self.hard = stats['breakdown']
+        self.last_status = stats['solved_today']
+
+    def copy(self):
+        return replace(self)
+
+
+def load_records(data):
+    """Parse the user_data.json mapping into {discord_id: UserRecord}"""
+    return {discord_id: UserRecord.from_json(value) for discord_id, value in data.items()}
+
+
+def dump_records(users_db):
+    """Inverse of load_records, in the existing JSON format"""
+    return {discord_id: record.to_json() for discord_id, record in users_db.items()}
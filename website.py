@@ -1,54 +1,64 @@
-from flask import Flask, render_template
+from flask import Flask, Response, jsonify, render_template, request
 from threading import Thread
-import json
 import logging
 
+from live_updates import broadcaster, user_card
+from community_stats import community_stats
+from health import health
+
 # Suppress Flask server logs to keep console clean
 log = logging.getLogger('werkzeug')
 log.setLevel(logging.ERROR)
 
 app = Flask(__name__)
 
-def get_db():
-    try:
-        with open('user_data.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
+# The bot's in-memory {discord_id: UserRecord}, shared via start_website()
+users_db = {}
 
 @app.route('/')
 def dashboard():
-    data = get_db()
-    users = []
+    # Capture the stream position first so the page never misses a diff
+    event_id = broadcaster.event_id
     
-    # Process data for the template
-    for discord_id, info in data.items():
-        # Handle simple string (old format) vs dict (new format)
-        if isinstance(info, str):
-            users.append({
-                'username': info, 
-                'solved': 0, 
-                'breakdown': [0,0,0], 
-                'discord_id': discord_id, 
-                'status': False
-            })
-        else:
-            users.append({
-                'username': info.get('leetcode_username', 'Unknown'),
-                'solved': info.get('total_solved', 0),
-                'breakdown': info.get('breakdown', [0,0,0]), # [Easy, Med, Hard]
-                'discord_id': discord_id,
-                'status': info.get('last_status', False)
-            })
+    # Process data for the template (list() copies atomically while the bot updates)
+    users = [user_card(discord_id, record) for discord_id, record in list(users_db.items())]
     
     # Sort for Leaderboard (Most solved first)
     users.sort(key=lambda x: x['solved'], reverse=True)
     
-    return render_template('index.html', users=users)
+    # Headline numbers come from the running aggregates, not a per-request scan
+    stats = community_stats.summary()
+    
+    return render_template('index.html', users=users, stats=stats, event_id=event_id)
+
+@app.route('/events')
+def events():
+    """Server-Sent Events stream of changed user records"""
+    # Browsers send Last-Event-ID on reconnect; first connections pass ?since=
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    stream = broadcaster.stream(since)
+    return Response(stream, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/healthz')
+def healthz():
+    """Liveness: the bot's event loop is still running"""
+    ok, details = health.liveness()
+    return jsonify(details), 200 if ok else 503
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: connected to Discord, loop responsive, plus sync/flush state"""
+    ok, details = health.readiness()
+    return jsonify(details), 200 if ok else 503
 
 def run():
-    app.run(host='0.0.0.0', port=8080)
+    app.run(host='0.0.0.0', port=8080, threaded=True)
 
-def start_website():
+def start_website(db):
+    global users_db
+    users_db = db
     t = Thread(target=run)
-    t.start()
\ No newline at end of file
+    t.start()